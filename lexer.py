@@ -1,11 +1,11 @@
-from enum import Enum
+from enum import IntEnum
 
 
 class LexerError(Exception):
     pass
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
     TYPE = 0
     IDENTIFIER = 1
     STRING_LITERAL = 2
@@ -19,45 +19,50 @@ class TokenType(Enum):
     END_OF_INPUT = 10
 
 
-class Token:
-    def __init__(self, lexeme: str, type_: TokenType) -> None:
-        self.lexeme = lexeme
-        self.type_ = type_
-
-    def __str__(self) -> str:
-        return f"{self.type_}(\"{self.lexeme}\")"
-
-
-def tokenize(input_: str) -> list[Token]:
+def tokenize(input_: str) -> tuple[bytes, list[str]]:
+    # structure of arrays: the token alphabet fits in one byte, so the type
+    # codes form a contiguous bytes buffer that the parser can dispatch on
+    # directly and scan with the C-level bytes machinery (index/count)
     lexer = Lexer(input_)
-    tokens = list()
+    types = bytearray()
+    lexemes: list[str] = []
+    append_type = types.append
+    append_lexeme = lexemes.append
     while not lexer.is_end_of_input():
         match lexer.current():
             case "(":
-                tokens.append(Token(lexer.current(), TokenType.LEFT_PARENTHESIS))
+                append_type(TokenType.LEFT_PARENTHESIS)
+                append_lexeme("(")
                 lexer.next()
             case ")":
-                tokens.append(Token(lexer.current(), TokenType.RIGHT_PARENTHESIS))
+                append_type(TokenType.RIGHT_PARENTHESIS)
+                append_lexeme(")")
                 lexer.next()
             case "=":
-                tokens.append(Token(lexer.current(), TokenType.EQUALS))
+                append_type(TokenType.EQUALS)
+                append_lexeme("=")
                 lexer.next()
             case "|":
-                tokens.append(Token(lexer.current(), TokenType.PIPE))
+                append_type(TokenType.PIPE)
+                append_lexeme("|")
                 lexer.next()
             case "{":
-                tokens.append(string_literal(lexer))
+                append_type(TokenType.STRING_LITERAL)
+                append_lexeme(string_literal(lexer))
             case "/":
                 comment(lexer)
             case _:
                 if lexer.current().isspace():
                     lexer.next()
                 elif is_valid_identifier_start(lexer.current()):
-                    tokens.append(identifier_or_keyword(lexer))
+                    type_, contents = identifier_or_keyword(lexer)
+                    append_type(type_)
+                    append_lexeme(contents)
                 else:
                     raise LexerError(f"unexpected input \"{lexer.current()}\"")
-    tokens.append(Token("", TokenType.END_OF_INPUT))
-    return tokens
+    append_type(TokenType.END_OF_INPUT)
+    append_lexeme("")
+    return bytes(types), lexemes
 
 
 def comment(lexer: "Lexer") -> None:
@@ -78,7 +83,7 @@ def is_valid_identifier_char(c: str) -> bool:
     return is_valid_identifier_start(c) or c == "_" or c.isdecimal()
 
 
-def identifier_or_keyword(lexer: "Lexer") -> Token:
+def identifier_or_keyword(lexer: "Lexer") -> tuple[TokenType, str]:
     starting_index = lexer.index
     while not lexer.is_end_of_input() and is_valid_identifier_char(lexer.current()):
         lexer.next()
@@ -92,11 +97,11 @@ def identifier_or_keyword(lexer: "Lexer") -> Token:
     }
 
     if contents not in keywords:
-        return Token(contents, TokenType.IDENTIFIER)
-    return Token(contents, keywords[contents])
+        return TokenType.IDENTIFIER, contents
+    return keywords[contents], contents
 
 
-def string_literal(lexer: "Lexer") -> Token:
+def string_literal(lexer: "Lexer") -> str:
     assert lexer.current() == "{"
     starting_index = lexer.index
     lexer.next()  # consume "{"
@@ -111,8 +116,9 @@ def string_literal(lexer: "Lexer") -> Token:
         raise LexerError("unclosed string literal")
     assert lexer.current() == "}"
     lexer.next()  # consume "}"
-    contents = lexer.input_[starting_index:lexer.index]
-    return Token(contents, TokenType.STRING_LITERAL)
+    # store the literal already unquoted and stripped so the parser never has
+    # to re-slice it
+    return lexer.input_[starting_index + 1:lexer.index - 1].strip()
 
 
 class Lexer:
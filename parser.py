@@ -1,6 +1,17 @@
-from collections import OrderedDict
-
-from lexer import Token, TokenType
+from lexer import TokenType
+
+# token types as plain ints, so the hot comparisons skip enum attribute lookup
+_TT_TYPE = int(TokenType.TYPE)
+_TT_IDENTIFIER = int(TokenType.IDENTIFIER)
+_TT_STRING_LITERAL = int(TokenType.STRING_LITERAL)
+_TT_EQUALS = int(TokenType.EQUALS)
+_TT_LEFT_PARENTHESIS = int(TokenType.LEFT_PARENTHESIS)
+_TT_RIGHT_PARENTHESIS = int(TokenType.RIGHT_PARENTHESIS)
+_TT_PIPE = int(TokenType.PIPE)
+_TT_BY_MOVE = int(TokenType.BY_MOVE)
+_TT_FUNCTION = int(TokenType.FUNCTION)
+_TT_IMPLEMENT = int(TokenType.IMPLEMENT)
+_TT_END_OF_INPUT = int(TokenType.END_OF_INPUT)
 
 
 class ParserError(Exception):
@@ -8,6 +19,8 @@ class ParserError(Exception):
 
 
 class Member:
+    __slots__ = ("name", "by_move", "type_")
+
     def __init__(self, name: str, by_move: bool, type_: str) -> None:
         self.name = name
         self.by_move = by_move
@@ -18,28 +31,37 @@ class Member:
 
 
 class PureVirtualFunction:
+    __slots__ = ("name", "return_type")
+
     def __init__(self, name: str, return_type: str | None) -> None:
         self.name = name
         self.return_type = return_type
 
 
 class Implementation:
+    __slots__ = ("name", "body")
+
     def __init__(self, name: str, body: str) -> None:
         self.name = name
         self.body = body
 
 
 class PolymorphicType:
+    __slots__ = ("pure_virtual_functions", "members", "implementations")
+
     def __init__(self, pure_virtual_functions: list[PureVirtualFunction], members: list[Member],
                  implementations: list[Implementation]) -> None:
-        if len(set(function.name for function in pure_virtual_functions)) != len(
-                [function.name for function in pure_virtual_functions]):
-            raise ParserError("duplicate declaration of pure virtual functions")
-        if len(set(function.name for function in implementations)) != len(
-                [function.name for function in implementations]):
-            raise ParserError("duplicate implementation")
-        if set(function.name for function in pure_virtual_functions) != set(
-                function.name for function in implementations):
+        pure_virtual_function_names: set[str] = set()
+        for function in pure_virtual_functions:
+            if function.name in pure_virtual_function_names:
+                raise ParserError("duplicate declaration of pure virtual functions")
+            pure_virtual_function_names.add(function.name)
+        implementation_names: set[str] = set()
+        for function in implementations:
+            if function.name in implementation_names:
+                raise ParserError("duplicate implementation")
+            implementation_names.add(function.name)
+        if pure_virtual_function_names != implementation_names:
             raise ParserError("not all pure virtual functions are implemented")
 
         self.pure_virtual_functions = pure_virtual_functions
@@ -51,6 +73,8 @@ class PolymorphicType:
 
 
 class AbstractType:
+    __slots__ = ("sub_types", "members", "pure_virtual_functions")
+
     def __init__(self, sub_types: dict[str, PolymorphicType],
                  members: list[Member],
                  pure_virtual_functions: list[PureVirtualFunction]) -> None:
@@ -68,130 +92,194 @@ class GeneratorDescription:
         self.postlude = postlude
 
     def __str__(self) -> str:
-        result = f"Includes:\n{self.prelude}\n"
-        result += "Type Definitions:\n" + "\n".join(
-            str(definition) for definition in self.type_definitions) + "\n\nPolymorphic types:\n"
+        # collect parts and join once instead of growing a str quadratically
+        parts = [f"Includes:\n{self.prelude}\n", "Type Definitions:\n", "\n".join(
+            str(definition) for definition in self.type_definitions), "\n\nPolymorphic types:\n"]
         for name, type_ in self.abstract_types.items():
-            result += f"\t{name}:\n"
+            parts.append(f"\t{name}:\n")
             for member_name, member_type in type_.sub_types.items():
-                result += f"\t\t{member_name}:\n{member_type}\n"
-        return result
+                parts.append(f"\t\t{member_name}:\n{member_type}\n")
+        return "".join(parts)
 
 
 class Parser:
-    def __init__(self, tokens: list[Token]) -> None:
-        self.tokens = tokens
+    def __init__(self, types: bytes, lexemes: list[str]) -> None:
+        self.types = types
+        self.lexemes = lexemes
         self.index = 0
+        self.n = len(types)
 
-    def current(self) -> Token:
-        return self.tokens[self.index]
+    def peek_type(self) -> int:
+        # cheap lookahead: just the type code, no bounds error past the end
+        if self.index < self.n:
+            return self.types[self.index]
+        return _TT_END_OF_INPUT
 
     def next(self) -> None:
         self.index += 1
 
-    def peek(self) -> Token | None:
-        if self.is_end_of_input():
-            return None
-        return self.tokens[self.index + 1]
+    def lexeme_at(self, index: int) -> str:
+        return self.lexemes[index]
 
     def is_end_of_input(self) -> bool:
-        return self.index >= len(self.tokens) or self.current().type_ == TokenType.END_OF_INPUT
-
-    def consume(self, type_: TokenType) -> Token:
-        if self.is_end_of_input():
-            raise ParserError("unexpected end of input")
-        if self.current().type_ != type_:
+        # the lexer always terminates the stream with an END_OF_INPUT
+        # sentinel, so a single type compare suffices; the defensive bounds
+        # check uses the cached length instead of calling len()
+        return self.index >= self.n or self.types[self.index] == _TT_END_OF_INPUT
+
+    def consume(self, type_: int) -> str:
+        # the success path is one int compare and two list indexes; all error
+        # formatting lives on the slow path (the sentinel token guarantees
+        # that self.index never runs past the end of the stream)
+        index = self.index
+        tt = self.types[index]
+        if tt != type_:
+            if tt == _TT_END_OF_INPUT:
+                raise ParserError("unexpected end of input")
             raise ParserError(
-                f'unexpected token type (expected {type_}, got {self.current().type_} ["{self.current().lexeme}"])')
-        result = self.current()
-        self.next()
-        return result
-
-
-def parse(tokens: list[Token]) -> GeneratorDescription:
-    parser = Parser(tokens)
-    type_definitions: list[tuple[str, str]] = list()
-    polymorphic_types: dict[str, AbstractType] = OrderedDict()
-    if parser.current().type_ == TokenType.STRING_LITERAL:
-        prelude = parser.current().lexeme[1:-1].strip()
+                f'unexpected token type (expected {TokenType(type_).name}, '
+                f'got {TokenType(tt).name} ["{self.lexemes[index]}"])')
+        lexeme = self.lexemes[index]
+        self.index = index + 1
+        return lexeme
+
+
+def parse(token_stream: tuple[bytes, list[str]]) -> GeneratorDescription:
+    types, lexemes = token_stream
+    parser = Parser(types, lexemes)
+    type_definitions: list[tuple[str, str]] = []
+    polymorphic_types: dict[str, AbstractType] = {}
+    if parser.peek_type() == _TT_STRING_LITERAL:
+        prelude = lexemes[parser.index]
         parser.next()  # consume prelude
     else:
         prelude = ""
     postlude = ""
-    while not parser.is_end_of_input():
-        match parser.current().type_:
-            case TokenType.TYPE:
-                parser.next()  # consume "type"
-                identifier = parser.consume(TokenType.IDENTIFIER)
-                contents = parser.consume(TokenType.STRING_LITERAL).lexeme[1:-1].strip()
-                type_definitions.append((identifier.lexeme, contents))
-            case TokenType.IDENTIFIER:  # polymorphic type
-                identifier = parser.consume(TokenType.IDENTIFIER)
-                parser.consume(TokenType.LEFT_PARENTHESIS)
-
-                base_type_members: list[Member] = list()
-                while parser.current().type_ == TokenType.IDENTIFIER:
-                    base_type_members.append(parse_data_member(parser))
-
-                functions: list[PureVirtualFunction] = list()
-                while parser.current().type_ == TokenType.FUNCTION:
-                    parser.consume(TokenType.FUNCTION)
-                    function_identifier = parser.consume(TokenType.IDENTIFIER).lexeme
-                    return_type_string = parser.consume(TokenType.STRING_LITERAL).lexeme[1:-1].strip()
-                    function_return_type = return_type_string if len(return_type_string) > 0 else None
-                    functions.append(PureVirtualFunction(function_identifier, function_return_type))
-
-                parser.consume(TokenType.RIGHT_PARENTHESIS)
-                parser.consume(TokenType.EQUALS)
-                sub_types: dict[str, PolymorphicType] = dict()
-                name, members, implementations = parse_subtype(parser)
-                polymorphic_type = PolymorphicType(functions, members, implementations)
-                sub_types[name] = polymorphic_type
-                while parser.current().type_ == TokenType.PIPE:
-                    parser.next()  # consume "|"
-                    name, members, implementations = parse_subtype(parser)
-                    polymorphic_type = PolymorphicType(functions, members, implementations)
-                    sub_types[name] = polymorphic_type
-                polymorphic_types[identifier.lexeme] = AbstractType(sub_types, base_type_members, functions)
-            case TokenType.STRING_LITERAL:
-                postlude = parser.current().lexeme[1:-1].strip()
-                parser.next()  # consume postlude
-                break
-            case _:
-                raise ParserError(f'unexpected token "{parser.current().type_}"')
+    number_of_tokens = len(types)
+    while parser.index < number_of_tokens:
+        tt = types[parser.index]
+        if tt == _TT_END_OF_INPUT:
+            break
+        handler = _HANDLER_TABLE[tt]
+        if handler is None:
+            raise ParserError(f'unexpected token "{TokenType(tt).name}"')
+        consumed_postlude = handler(parser, type_definitions, polymorphic_types)
+        if consumed_postlude is not None:
+            postlude = consumed_postlude
+            break
     if not parser.is_end_of_input():
         # we are behind the postlude but the input is not completely depleted
         raise ParserError(f'the postlude must be the last part of the file')
     return GeneratorDescription(prelude, type_definitions, polymorphic_types, postlude)
 
 
+# the handlers share a common signature so that parse can dispatch through a
+# single table lookup; they return the postlude once they consume it, which
+# ends the top-level loop
+
+def _handle_type_definition(parser: Parser, type_definitions: list[tuple[str, str]],
+                            polymorphic_types: dict[str, "AbstractType"]) -> str | None:
+    parser.next()  # consume "type"
+    identifier = parser.consume(_TT_IDENTIFIER)
+    contents = parser.consume(_TT_STRING_LITERAL)
+    type_definitions.append((identifier, contents))
+    return None
+
+
+def _handle_polymorphic_type(parser: Parser, type_definitions: list[tuple[str, str]],
+                             polymorphic_types: dict[str, "AbstractType"]) -> str | None:
+    # bind the needed type codes as locals: LOAD_FAST instead of LOAD_GLOBAL
+    # in every loop iteration
+    tt_identifier = _TT_IDENTIFIER
+    tt_by_move = _TT_BY_MOVE
+    tt_string_literal = _TT_STRING_LITERAL
+    tt_function = _TT_FUNCTION
+    tt_pipe = _TT_PIPE
+    types = parser.types
+    identifier = parser.lexemes[parser.index]
+    parser.next()  # the dispatch in parse already checked for IDENTIFIER
+    parser.consume(_TT_LEFT_PARENTHESIS)
+
+    # data members are parsed inline to keep the hot loop free of helper frames
+    base_type_members: list[Member] = []
+    while types[parser.index] == tt_identifier:
+        member_name = parser.consume(tt_identifier)
+        by_move = types[parser.index] == tt_by_move
+        if by_move:
+            parser.next()  # consume "by_move"
+        member_type = parser.consume(tt_string_literal)
+        base_type_members.append(Member(member_name, by_move, member_type))
+
+    functions: list[PureVirtualFunction] = []
+    while types[parser.index] == tt_function:
+        parser.consume(tt_function)
+        function_identifier = parser.consume(tt_identifier)
+        return_type_string = parser.consume(tt_string_literal)
+        function_return_type = return_type_string if len(return_type_string) > 0 else None
+        functions.append(PureVirtualFunction(function_identifier, function_return_type))
+
+    parser.consume(_TT_RIGHT_PARENTHESIS)
+    parser.consume(_TT_EQUALS)
+    sub_types: dict[str, PolymorphicType] = {}
+    name, members, implementations = parse_subtype(parser)
+    polymorphic_type = PolymorphicType(functions, members, implementations)
+    sub_types[name] = polymorphic_type
+    while types[parser.index] == tt_pipe:
+        parser.next()  # consume "|"
+        name, members, implementations = parse_subtype(parser)
+        if name in sub_types:
+            raise ParserError(f'duplicate subtype "{name}"')
+        polymorphic_type = PolymorphicType(functions, members, implementations)
+        sub_types[name] = polymorphic_type
+    polymorphic_types[identifier] = AbstractType(sub_types, base_type_members, functions)
+    return None
+
+
+def _handle_postlude(parser: Parser, type_definitions: list[tuple[str, str]],
+                     polymorphic_types: dict[str, "AbstractType"]) -> str | None:
+    postlude = parser.lexemes[parser.index]
+    parser.next()  # consume postlude
+    return postlude
+
+
+# dense table indexed by token type code: dispatch is a single list index
+# instead of a dict hash + compare (the token alphabet is small and contiguous)
+_HANDLER_TABLE = [None] * (max(TokenType) + 1)
+_HANDLER_TABLE[_TT_TYPE] = _handle_type_definition
+_HANDLER_TABLE[_TT_IDENTIFIER] = _handle_polymorphic_type
+_HANDLER_TABLE[_TT_STRING_LITERAL] = _handle_postlude
+
+
 def parse_subtype(parser: Parser) -> tuple[str, list[Member], list[Implementation]]:
-    identifier = parser.consume(TokenType.IDENTIFIER)
-    parser.consume(TokenType.LEFT_PARENTHESIS)
-    members: list[Member] = list()
-    implementations: list[Implementation] = list()
+    tt_identifier = _TT_IDENTIFIER
+    tt_by_move = _TT_BY_MOVE
+    tt_string_literal = _TT_STRING_LITERAL
+    tt_implement = _TT_IMPLEMENT
+    identifier = parser.consume(tt_identifier)
+    parser.consume(_TT_LEFT_PARENTHESIS)
+    members: list[Member] = []
+    implementations: list[Implementation] = []
+    types = parser.types
     while True:
-        if parser.current().type_ == TokenType.IDENTIFIER:
-            members.append(parse_data_member(parser))
-        elif parser.current().type_ == TokenType.IMPLEMENT:
+        tt = types[parser.index]
+        if tt == tt_identifier:
+            # data member, parsed inline (see _handle_polymorphic_type)
+            member_name = parser.consume(tt_identifier)
+            by_move = types[parser.index] == tt_by_move
+            if by_move:
+                parser.next()  # consume "by_move"
+            member_type = parser.consume(tt_string_literal)
+            members.append(Member(member_name, by_move, member_type))
+        elif tt == tt_implement:
             implementations.append(parse_implementation(parser))
         else:
             break
-    parser.consume(TokenType.RIGHT_PARENTHESIS)
-    return identifier.lexeme, members, implementations
-
-
-def parse_data_member(parser: Parser) -> Member:
-    member_name = parser.consume(TokenType.IDENTIFIER)
-    by_move = parser.current().type_ == TokenType.BY_MOVE
-    if by_move:
-        parser.next()  # consume "by_move"
-    member_type = parser.consume(TokenType.STRING_LITERAL).lexeme[1:-1].strip()
-    return Member(member_name.lexeme, by_move, member_type)
+    parser.consume(_TT_RIGHT_PARENTHESIS)
+    return identifier, members, implementations
 
 
 def parse_implementation(parser: Parser) -> Implementation:
-    parser.consume(TokenType.IMPLEMENT)
-    function_name = parser.consume(TokenType.IDENTIFIER).lexeme
-    function_body = parser.consume(TokenType.STRING_LITERAL).lexeme[1:-1].strip()
+    parser.consume(_TT_IMPLEMENT)
+    function_name = parser.consume(_TT_IDENTIFIER)
+    function_body = parser.consume(_TT_STRING_LITERAL)
     return Implementation(function_name, function_body)
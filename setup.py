@@ -0,0 +1,17 @@
+from setuptools import setup
+
+# The lexer and the parser are pure attribute/tuple churn in tight loops, so
+# they profit the most from being compiled ahead of time. Cython is optional:
+# without it (or without a C toolchain) the plain Python modules are used.
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    extension_modules = []
+else:
+    extension_modules = cythonize(["lexer.py", "parser.py"], language_level=3)
+
+setup(
+    name="ast-node-generator",
+    py_modules=["lexer", "parser", "emitter", "main"],
+    ext_modules=extension_modules,
+)